@@ -0,0 +1,68 @@
+"""Startup-time benchmark for cli.py.
+
+Checks that ``cli.py --help`` and argument parsing stay under BUDGET_MS and
+that parsing does not pull in the neo4j driver or NumPy. Exits non-zero when
+the budget is exceeded.
+"""
+import os
+import subprocess
+import sys
+import time
+
+BUDGET_MS = 100
+RUNS = 10
+HEAVY_MODULES = ("neo4j", "numpy")
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+SAMPLE_ARGV = [
+    ["seed"],
+    ["rate", "Natalia", "Krawczyk", "4.0", "Opowieść o dwóch miastach"],
+    ["--format", "tsv", "books-by-year", "1950", "2000", "fantasy"],
+    ["similar-users", "Natalia", "Krawczyk", "--section", "similar"],
+]
+
+# Runs in a fresh interpreter so imports done by this script do not count.
+PARSE_SNIPPET = """
+import sys, time
+start = time.perf_counter()
+import cli
+parser = cli.build_parser()
+for argv in %r:
+    parser.parse_args(argv)
+elapsed = (time.perf_counter() - start) * 1000
+heavy = [name for name in %r if name in sys.modules]
+print(elapsed, ",".join(heavy))
+"""
+
+
+def best_of(fn):
+    return min(fn() for _ in range(RUNS))
+
+
+def time_help():
+    start = time.perf_counter()
+    subprocess.run([sys.executable, os.path.join(HERE, "cli.py"), "--help"],
+                   check=True, stdout=subprocess.DEVNULL, cwd=HERE)
+    return (time.perf_counter() - start) * 1000
+
+
+def time_parse():
+    out = subprocess.run([sys.executable, "-c", PARSE_SNIPPET % (SAMPLE_ARGV, HEAVY_MODULES)],
+                         check=True, capture_output=True, text=True, cwd=HERE).stdout.split()
+    if len(out) > 1:
+        raise SystemExit("argument parsing imported %s" % out[1])
+    return float(out[0])
+
+
+def main():
+    failed = False
+    for label, fn in (("cli.py --help", time_help), ("argument parsing", time_parse)):
+        elapsed = best_of(fn)
+        ok = elapsed < BUDGET_MS
+        failed = failed or not ok
+        print("%-20s %7.1f ms  %s" % (label, elapsed, "ok" if ok else "over %d ms budget" % BUDGET_MS))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
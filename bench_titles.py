@@ -0,0 +1,88 @@
+"""Behaviour and timing check for the in-process title cache (titles.py).
+
+Checks fold, TitleIndex.resolve and TitleIndex.complete on the dataset
+titles, then times them on a cache of SYNTHETIC_TITLES titles. Each call
+must average under BUDGET_US microseconds. Needs no database. Exits
+non-zero on a wrong answer or when the budget is exceeded.
+"""
+import sys
+import time
+
+import dataset
+from titles import TitleIndex, fold, fulltext_query
+
+BUDGET_US = 1000
+SYNTHETIC_TITLES = 100000
+CALLS = 10000
+
+# (argument, expected result) pairs for the pure helpers.
+FOLD_CASES = [
+    ("Harry Potter i kamień Filozoficzny", "harry potter i kamien filozoficzny"),
+    ("Dziewczę z sadu ", "dziewcze z sadu"),
+    ("  Władca   Pierścieni. ", "wladca pierscieni."),
+    ("ŁÓDŹ", "lodz"),
+]
+QUERY_CASES = [
+    ("Saint-Exupéry", "(saint~ OR saint*) AND (exupery~ OR exupery*)"),
+    (" -- ", ""),
+]
+
+
+def _check(label, got, expected):
+    if got != expected:
+        raise SystemExit("%s: got %r, expected %r" % (label, got, expected))
+
+
+def check_behaviour():
+    for text, expected in FOLD_CASES:
+        _check("fold(%r)" % text, fold(text), expected)
+    for text, expected in QUERY_CASES:
+        _check("fulltext_query(%r)" % text, fulltext_query(text), expected)
+
+    # Dataset titles with their positions in dataset.BOOKS as ids.
+    titles = [row[0] for row in dataset.BOOKS]
+    index = TitleIndex(enumerate(titles))
+    _check("resolve exact", index.resolve("Alchemik"), [(26, "Alchemik")])
+    _check("resolve folded", index.resolve("harry potter i KAMIEN filozoficzny"),
+           [(13, "Harry Potter i kamień Filozoficzny")])
+    _check("resolve trailing space", index.resolve("Dziewczę z sadu"), [(2, "Dziewczę z sadu ")])
+    _check("resolve duplicate", [book_id for book_id, _ in index.resolve("Władca Pierścieni. Drużyna Pierścienia")],
+           [6, 9])
+    _check("resolve unknown", index.resolve("Harry Potter"), [])
+    _check("complete", [title for _, title in index.complete("ania z", 5)],
+           ["Ania z Avonlea", "Ania z Zielonego wzgórza"])
+    _check("complete limit", len(index.complete("harry", 3)), 3)
+    _check("complete unknown", index.complete("zzz"), [])
+
+    index.add("new", "Ania z Zielonego Wzgórza II")
+    _check("complete after add", [title for _, title in index.complete("ania z z")],
+           ["Ania z Zielonego wzgórza", "Ania z Zielonego Wzgórza II"])
+
+
+def per_call_us(fn, args):
+    start = time.perf_counter()
+    for arg in args:
+        fn(arg)
+    return (time.perf_counter() - start) * 1e6 / len(args)
+
+
+def main():
+    check_behaviour()
+    print("behaviour            ok")
+
+    index = TitleIndex(("id%d" % i, "Książka numer %d część %d" % (i, i % 7)) for i in range(SYNTHETIC_TITLES))
+    titles = ["KSIĄZKA NUMER %d CZESC %d" % (i, i % 7) for i in range(0, SYNTHETIC_TITLES, SYNTHETIC_TITLES // CALLS)]
+    prefixes = ["książka numer %d" % (i % 1000) for i in range(CALLS)]
+    failed = False
+    for label, fn, args in (("fold", fold, titles),
+                            ("resolve", index.resolve, titles),
+                            ("complete", index.complete, prefixes)):
+        elapsed = min(per_call_us(fn, args) for _ in range(3))
+        ok = elapsed < BUDGET_US
+        failed = failed or not ok
+        print("%-20s %7.1f us  %s" % (label, elapsed, "ok" if ok else "over %d us budget" % BUDGET_US))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""Command line interface for the library graph.
+
+Connection settings come from NEO4J_URI, NEO4J_USER and NEO4J_PASSWORD, or
+from the [neo4j] section of an INI file given with --config (or NEO4J_CONFIG);
+the environment wins over the file.
+
+The neo4j driver is only imported once a subcommand actually runs, so
+``--help`` and argument parsing stay cheap (see bench_startup.py).
+"""
+import argparse
+import os
+import sys
+
+DEFAULT_URI = "bolt://localhost:7687"
+DEFAULT_USER = "neo4j"
+
+
+def load_settings(config_path=None):
+    settings = {"uri": DEFAULT_URI, "user": DEFAULT_USER, "password": None}
+    config_path = config_path or os.environ.get("NEO4J_CONFIG")
+    if config_path:
+        import configparser
+        parser = configparser.ConfigParser()
+        if not parser.read(config_path, encoding="utf-8"):
+            raise SystemExit("cannot read config file %s" % config_path)
+        if parser.has_section("neo4j"):
+            for key in settings:
+                settings[key] = parser.get("neo4j", key, fallback=settings[key])
+    for key in settings:
+        settings[key] = os.environ.get("NEO4J_" + key.upper(), settings[key])
+    if settings["password"] is None:
+        raise SystemExit("no password configured: set NEO4J_PASSWORD or use --config")
+    return settings
+
+
+def _as_dict(row):
+    if hasattr(row, "data"):
+        return row.data()
+    if isinstance(row, dict):
+        return row
+    return {"name": row}
+
+
+def _tsv_field(value):
+    if value is None:
+        return ""
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+def write_rows(rows, fmt, out=None):
+    out = out or sys.stdout
+    rows = [_as_dict(row) for row in rows]
+    if fmt == "json":
+        import json
+        json.dump(rows, out, ensure_ascii=False, indent=2, default=str)
+        out.write("\n")
+        return
+    if not rows:
+        return
+    header = list(rows[0])
+    out.write("\t".join(header) + "\n")
+    for row in rows:
+        out.write("\t".join(_tsv_field(row.get(key)) for key in header) + "\n")
+
+
+# --- subcommand handlers: each takes (app, args) and returns rows or None ---
+
+def _seed(app, args):
+    import dataset
+    app.create_lookup_indexes()
+    app.create_title_index()
+    dataset.seed(app)
+
+
+def _matched(rows, message, *values):
+    """Return rows, or exit non-zero with message when the write matched nothing."""
+    if not rows:
+        raise SystemExit(message % values)
+    return rows
+
+
+def _create_reader(app, args):
+    return app.create_reader(args.name, args.surname)
+
+
+def _create_author(app, args):
+    return app.create_author(args.name, args.surname)
+
+
+def _create_publisher(app, args):
+    return app.create_publisher(args.name)
+
+
+def _create_book(app, args):
+    rows = app.create_book(args.title, args.year, args.category, args.author_name, args.author_surname, args.publisher)
+    return _matched(rows, "book not created: no author %s %s or no publisher %s",
+                    args.author_name, args.author_surname, args.publisher)
+
+
+def _book_id(app, args):
+    """Id of the one book args.title names; exits listing candidates otherwise."""
+    if args.by_id:
+        return args.title
+    candidates = app.resolve_title(args.title)
+    if not candidates:
+        raise SystemExit("no book matches %r" % args.title)
+    if any(row["id"] is None for row in candidates):
+        raise SystemExit("%r matches a book without an id; run assign-book-ids first" % args.title)
+    if len(candidates) == 1:
+        return candidates[0]["id"]
+    raise SystemExit("%r matches several books, pass one of these ids with --by-id:\n%s" % (
+        args.title, "\n".join("  %s\t%s\t%s" % (row["id"], row["title"], row.get("author") or "")
+                               for row in candidates)))
+
+
+def _rate(app, args):
+    rows = app.create_relation_book_reader_by_id(args.name, args.surname, args.mark, _book_id(app, args))
+    return _matched(rows, "nothing rated: no reader %s %s", args.name, args.surname)
+
+
+def _author_books(app, args):
+    return app.find_all_authors_books(args.name, args.surname)
+
+
+def _other_read_also(app, args):
+    return app.other_read_also_by_id(_book_id(app, args))
+
+
+def _books_by_year(app, args):
+    return app.find_book_by_year_and_category(args.since, args.to, args.category)
+
+
+def _best_books(app, args):
+    return app.best_book()
+
+
+def _publisher_counts(app, args):
+    return app.how_many_books_publisher()
+
+
+def _best_authors(app, args):
+    return app.best_author()
+
+
+def _similar_users(app, args):
+    mean, similar, recommended = app.get_similar_users(args.name, args.surname)
+    return {"mean": mean, "similar": similar, "recommended": recommended}[args.section]
+
+
+def _set_periods(app, args):
+    return app.set_literary_period_for_book()
+
+
+def _set_period_descriptions(app, args):
+    return app.set_literary_period_description()
+
+
+def _delete_reader(app, args):
+    return _matched(app.delete_reader(args.name, args.surname), "no reader %s %s", args.name, args.surname)
+
+
+def _create_indexes(app, args):
+    app.create_lookup_indexes()
+
+
+def _assign_book_ids(app, args):
+    return app.assign_book_ids()
+
+
+def _create_title_index(app, args):
+    app.create_title_index()
+
+
+def _resolve_title(app, args):
+    return app.resolve_title(args.title)
+
+
+def _complete_title(app, args):
+    return app.autocomplete_title(args.prefix, args.limit)
+
+
+def _search_titles(app, args):
+    return app.search_titles(args.text, args.limit)
+
+
+def _person(parser):
+    parser.add_argument("name")
+    parser.add_argument("surname")
+    return parser
+
+
+def _book(parser):
+    parser.add_argument("title", help="book title; case, diacritics and spacing may differ")
+    parser.add_argument("--by-id", action="store_true", help="treat title as a book id (see resolve-title)")
+    return parser
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description=__doc__.splitlines()[0])
+    parser.add_argument("--config", help="INI file with a [neo4j] section (uri, user, password)")
+    parser.add_argument("--format", choices=("json", "tsv"), default="json", help="output format (default: json)")
+    sub = parser.add_subparsers(dest="command", metavar="COMMAND", required=True)
+
+    # ingestion
+    sub.add_parser("seed", help="create the indexes and load the synthetic dataset").set_defaults(func=_seed)
+    _person(sub.add_parser("create-reader", help="add a reader")).set_defaults(func=_create_reader)
+    _person(sub.add_parser("create-author", help="add an author")).set_defaults(func=_create_author)
+    p = sub.add_parser("create-publisher", help="add a publisher")
+    p.add_argument("name")
+    p.set_defaults(func=_create_publisher)
+    p = sub.add_parser("create-book", help="add a book written by an existing author and publisher")
+    p.add_argument("title")
+    p.add_argument("year", type=int)
+    p.add_argument("category")
+    p.add_argument("author_name")
+    p.add_argument("author_surname")
+    p.add_argument("publisher")
+    p.set_defaults(func=_create_book)
+    p = _person(sub.add_parser("rate", help="record that a reader read and rated a book"))
+    p.add_argument("mark", type=float)
+    _book(p)
+    p.set_defaults(func=_rate)
+
+    # reports
+    _person(sub.add_parser("author-books", help="books written by an author")).set_defaults(func=_author_books)
+    p = _book(sub.add_parser("other-read-also", help="books read by readers of the given book"))
+    p.set_defaults(func=_other_read_also)
+    p = sub.add_parser("books-by-year", help="books of a category published in a year range")
+    p.add_argument("since", type=int)
+    p.add_argument("to", type=int)
+    p.add_argument("category")
+    p.set_defaults(func=_books_by_year)
+    sub.add_parser("best-books", help="top rated books").set_defaults(func=_best_books)
+    sub.add_parser("publisher-counts", help="number of books per publisher").set_defaults(func=_publisher_counts)
+    sub.add_parser("best-authors", help="authors ranked by mean mark of their books").set_defaults(func=_best_authors)
+
+    # title lookup
+    p = sub.add_parser("resolve-title", help="ids and stored titles for a loosely typed title")
+    p.add_argument("title")
+    p.set_defaults(func=_resolve_title)
+    p = sub.add_parser("complete-title", help="titles starting with a prefix")
+    p.add_argument("prefix")
+    p.add_argument("--limit", type=int, default=10)
+    p.set_defaults(func=_complete_title)
+    p = sub.add_parser("search-titles", help="fuzzy fulltext search over titles and author names")
+    p.add_argument("text")
+    p.add_argument("--limit", type=int, default=5)
+    p.set_defaults(func=_search_titles)
+
+    # recommendations
+    p = _person(sub.add_parser("similar-users", help="recommend books from similar readers"))
+    p.add_argument("--section", choices=("recommended", "similar", "mean"), default="recommended",
+                   help="which part of the similarity run to print (default: recommended)")
+    p.set_defaults(func=_similar_users)
+
+    # maintenance
+    sub.add_parser("set-periods", help="assign a literary period to every book").set_defaults(func=_set_periods)
+    sub.add_parser("set-period-descriptions", help="describe the literary period of every book").set_defaults(
+        func=_set_period_descriptions)
+    _person(sub.add_parser("delete-reader", help="remove a reader and their ratings")).set_defaults(
+        func=_delete_reader)
+    sub.add_parser("create-indexes", help="create the indexes used by keyed lookups").set_defaults(
+        func=_create_indexes)
+    sub.add_parser("assign-book-ids", help="give books created before book ids existed an id").set_defaults(
+        func=_assign_book_ids)
+    sub.add_parser("create-title-index", help="create the fulltext index used by search-titles").set_defaults(
+        func=_create_title_index)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    settings = load_settings(args.config)
+
+    from main import App
+    from neo4j.exceptions import AuthError, ServiceUnavailable
+    app = App(settings["uri"], settings["user"], settings["password"])
+    try:
+        app.driver.verify_connectivity()
+        rows = args.func(app, args)
+    except (AuthError, ServiceUnavailable) as exception:
+        raise SystemExit("cannot connect to %s: %s" % (settings["uri"], exception))
+    finally:
+        app.close()
+    if rows is not None:
+        write_rows(rows, args.format)
+
+
+if __name__ == "__main__":
+    main()
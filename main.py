@@ -1,26 +1,35 @@
 from neo4j import GraphDatabase
 import logging
-from neo4j.exceptions import ServiceUnavailable
+from neo4j.exceptions import ClientError, ServiceUnavailable
+from titles import TitleIndex, fulltext_query
+
+# A fulltext hit only resolves a title when it scores this many times
+# higher than the runner-up; otherwise every hit is returned as a candidate.
+CLEAR_MARGIN = 1.5
+TITLE_CANDIDATES = 5
 
 class App:
 
     def __init__(self, uri, user, password):
         self.driver = GraphDatabase.driver(uri, auth=(user, password))
+        self.titles = None
 
     def close(self):
         self.driver.close()
 
     def create_reader(self, reader_name, reader_surname):
         with self.driver.session() as session:
-            session.write_transaction(
+            result = session.write_transaction(
                 self._create_and_return_reader, reader_name, reader_surname
             )
+            return result
 
     @staticmethod
     def _create_and_return_reader(tx, reader_name, reader_surname):
         query = (
             """
             CREATE(r1:Reader {name: $reader_name, surname: $reader_surname})
+            RETURN r1
             """
         )
         result = tx.run(query, reader_name=reader_name, reader_surname=reader_surname)
@@ -34,20 +43,22 @@ class App:
 
     def create_author(self, author_name, author_surname):
         with self.driver.session() as session:
-            session.write_transaction(
+            result = session.write_transaction(
                 self._create_and_return_author, author_name, author_surname
             )
+            return result
 
     @staticmethod
     def _create_and_return_author(tx, author_name, author_surname):
         query = (
             """
             CREATE(a1:Author {name: $author_name, surname: $author_surname})
+            RETURN a1
             """
         )
         result = tx.run(query, author_name=author_name, author_surname=author_surname)
         try:
-            return [{"r1": row["r1"]["name"]}
+            return [{"a1": row["a1"]["name"]}
                     for row in result]
         except ServiceUnavailable as exception:
             logging.error("{query} raised an error: \n {exception}".format(
@@ -56,20 +67,22 @@ class App:
 
     def create_publisher(self, publisher_name):
         with self.driver.session() as session:
-            session.write_transaction(
+            result = session.write_transaction(
                 self._create_and_return_publisher, publisher_name
             )
+            return result
 
     @staticmethod
     def _create_and_return_publisher(tx, publisher_name):
         query = (
             """
             CREATE(p:Publisher {name: $publisher_name})
+            RETURN p
             """
         )
         result = tx.run(query, publisher_name=publisher_name)
         try:
-            return [{"r1": row["r1"]["name"]}
+            return [{"p": row["p"]["name"]}
                     for row in result]
         except ServiceUnavailable as exception:
             logging.error("{query} raised an error: \n {exception}".format(
@@ -78,9 +91,13 @@ class App:
 
     def create_book(self, book_name, book_years, book_category, author_name, author_surname, publisher_name):
         with self.driver.session() as session:
-            session.write_transaction(
+            result = session.write_transaction(
                 self._create_and_return_book, book_name, book_years, book_category, author_name, author_surname, publisher_name
             )
+            if self.titles is not None:
+                for row in result:
+                    self.titles.add(row["id"], row["name"])
+            return result
 
     @staticmethod
     def _create_and_return_book(tx, book_name, book_years, book_category, author_name, author_surname, publisher_name):
@@ -88,35 +105,215 @@ class App:
             """
             MATCH((a:Author {name: $author_name, surname: $author_surname})),
             ((p:Publisher {name: $publisher_name}))
-            CREATE (a)-[:WROTE]->(b:Book {name: $book_name, years: $book_years, category: $book_category})<-[:PUBLISH]-(p)
+            CREATE (a)-[:WROTE]->(b:Book {uid: randomUUID(), name: $book_name, years: $book_years, category: $book_category})<-[:PUBLISH]-(p)
+            RETURN b.uid AS id, b.name AS name
             """
         )
         result = tx.run(query, book_name=book_name, book_years=book_years, book_category=book_category,
                         author_name=author_name, author_surname=author_surname, publisher_name=publisher_name)
         try:
-            return [{"b1": row["b1"]["name"], "a1": row["a1"]["name"]}
+            return [{"id": row["id"], "name": row["name"]}
                     for row in result]
         except ServiceUnavailable as exception:
             logging.error("{query} raised an error: \n {exception}".format(
                 query=query, exception=exception))
             raise
 
-    def create_relation_book_reader(self, person_name, person_surname, mark, book_name):
+    def create_lookup_indexes(self):
+        with self.driver.session() as session:
+            session.write_transaction(
+                self._create_lookup_indexes
+            )
+
+    @staticmethod
+    def _create_lookup_indexes(tx):
+        queries = (
+            "CREATE CONSTRAINT bookUid IF NOT EXISTS FOR (b:Book) REQUIRE b.uid IS UNIQUE",
+            "CREATE INDEX authorName IF NOT EXISTS FOR (a:Author) ON (a.name, a.surname)",
+            "CREATE INDEX readerName IF NOT EXISTS FOR (r:Reader) ON (r.name, r.surname)",
+            "CREATE INDEX publisherName IF NOT EXISTS FOR (p:Publisher) ON (p.name)",
+            "CREATE INDEX bookName IF NOT EXISTS FOR (b:Book) ON (b.name)",
+            "CREATE INDEX bookCategory IF NOT EXISTS FOR (b:Book) ON (b.category)",
+        )
+        for query in queries:
+            tx.run(query).consume()
+
+    def assign_book_ids(self):
+        with self.driver.session() as session:
+            result = session.write_transaction(
+                self._assign_book_ids
+            )
+            if result:
+                self.titles = None
+            return result
+
+    @staticmethod
+    def _assign_book_ids(tx):
+        query = (
+            """
+            MATCH (b:Book)
+            WHERE b.uid IS NULL
+            SET b.uid = randomUUID()
+            RETURN b.uid AS id, b.name AS title
+            """
+        )
+        result = tx.run(query)
+        return [row for row in result]
+
+    def create_title_index(self):
         with self.driver.session() as session:
             session.write_transaction(
-                self._create_relation_book_reader, person_name, person_surname, mark, book_name
+                self._create_title_index
+            )
+
+    @staticmethod
+    def _create_title_index(tx):
+        query = (
+            """
+            CREATE FULLTEXT INDEX titleSearch IF NOT EXISTS
+            FOR (n:Book|Author) ON EACH [n.name, n.surname]
+            OPTIONS {indexConfig: {`fulltext.analyzer`: 'standard-folding'}}
+            """
+        )
+        result = tx.run(query)
+        return [row for row in result]
+
+    def title_index(self):
+        """Load the autocomplete cache on first use.
+
+        Loading reads every book, so the cache only pays off for a long-lived
+        App; resolve_title uses it only once something else has loaded it.
+        """
+        if self.titles is None:
+            with self.driver.session() as session:
+                result = session.read_transaction(
+                    self._find_all_titles
+                )
+            self.titles = TitleIndex((row["id"], row["title"]) for row in result)
+        return self.titles
+
+    @staticmethod
+    def _find_all_titles(tx):
+        query = (
+            """
+            MATCH (b:Book)
+            RETURN b.uid AS id, b.name AS title
+            """
+        )
+        result = tx.run(query)
+        return [row for row in result]
+
+    @staticmethod
+    def _find_books_by_name(tx, book_name):
+        query = (
+            """
+            MATCH (b:Book {name: $book_name})
+            RETURN b.uid AS id, b.name AS title
+            """
+        )
+        result = tx.run(query, book_name=book_name)
+        return [row for row in result]
+
+    def autocomplete_title(self, prefix, limit=10):
+        return [{"id": book_id, "title": title}
+                for book_id, title in self.title_index().complete(prefix, limit)]
+
+    def search_titles(self, text, limit=5):
+        search = fulltext_query(text)
+        if not search:
+            return []
+        with self.driver.session() as session:
+            try:
+                result = session.read_transaction(
+                    self._search_titles, search, limit
+                )
+            except ClientError as exception:
+                if "no such fulltext schema index" not in str(exception):
+                    raise
+                logging.warning("titleSearch index is missing, run create-title-index; "
+                                "treating %r as not found", text)
+                return []
+            return result
+
+    @staticmethod
+    def _search_titles(tx, search, limit):
+        query = (
+            """
+            CALL db.index.fulltext.queryNodes('titleSearch', $search) YIELD node, score
+            OPTIONAL MATCH (node)-[:WROTE]->(written:Book)
+            WITH coalesce(written, node) AS book, score
+            WHERE book:Book
+            WITH book, max(score) AS score
+            OPTIONAL MATCH (author:Author)-[:WROTE]->(book)
+            RETURN book.uid AS id, book.name AS title, author.name + ' ' + author.surname AS author, score
+            ORDER BY score DESC
+            LIMIT $limit
+            """
+        )
+        result = tx.run(query, search=search, limit=limit)
+        return [row for row in result]
+
+    def resolve_title(self, text):
+        """Return the books text may name, as [{"id": uid, "title": ...}].
+
+        Once title_index() has loaded the cache, exact folded matches are
+        answered in process in microseconds (see bench_titles.py); a
+        long-lived App should call title_index() once to get that path.
+        Otherwise resolution costs one or two indexed round trips: an exact
+        name lookup, then the fulltext index.
+        """
+        if self.titles is not None:
+            matches = self.titles.resolve(text)
+            if matches:
+                return [{"id": book_id, "title": title} for book_id, title in matches]
+        else:
+            with self.driver.session() as session:
+                result = session.read_transaction(
+                    self._find_books_by_name, text
+                )
+            if result:
+                return [{"id": row["id"], "title": row["title"]} for row in result]
+        result = self.search_titles(text, limit=TITLE_CANDIDATES)
+        if len(result) > 1 and result[0]["score"] >= CLEAR_MARGIN * result[1]["score"]:
+            result = result[:1]
+        return [{"id": row["id"], "title": row["title"], "author": row["author"]} for row in result]
+
+    def _book_ids(self, book_name):
+        with self.driver.session() as session:
+            result = session.read_transaction(
+                self._find_books_by_name, book_name
+            )
+        book_ids = [row["id"] for row in result]
+        if None in book_ids:
+            raise ValueError("{book_name!r} has no uid, run assign_book_ids first".format(book_name=book_name))
+        return book_ids
+
+    def create_relation_book_reader(self, person_name, person_surname, mark, book_name):
+        book_ids = self._book_ids(book_name)
+        with self.driver.session() as session:
+            result = session.write_transaction(
+                self._create_relation_book_reader, person_name, person_surname, mark, book_ids
+            )
+            return result
+
+    def create_relation_book_reader_by_id(self, person_name, person_surname, mark, book_id):
+        with self.driver.session() as session:
+            result = session.write_transaction(
+                self._create_relation_book_reader, person_name, person_surname, mark, [book_id]
             )
+            return result
 
     @staticmethod
-    def _create_relation_book_reader(tx, person_name, person_surname, mark, book_name):
+    def _create_relation_book_reader(tx, person_name, person_surname, mark, book_ids):
         query = (
             """
-            MATCH (r: Reader {name: $person_name, surname: $person_surname}), (b: Book {name: $book_name})
+            MATCH (r: Reader {name: $person_name, surname: $person_surname}), (b: Book)
+            WHERE b.uid IN $book_ids
             MERGE (r)-[rel:READ {mark: $mark}]->(b)
             RETURN r, rel, b
             """
         )
-        result = tx.run(query, person_name=person_name, mark=mark, person_surname=person_surname, book_name=book_name)
+        result = tx.run(query, person_name=person_name, mark=mark, person_surname=person_surname, book_ids=book_ids)
         try:
             return [{"r": row["r"]["name"], "b": row["b"]["name"]}
                     for row in result]
@@ -130,11 +327,7 @@ class App:
             result = session.read_transaction(
                 self._find_all_authors_books, author_name, author_surname
             )
-            print(author_name, author_surname, "books:")
-            i = 1
-            for row in result:
-                print(i, ". {row}".format(row=row))
-                i = i+1
+            return result
 
     @staticmethod
     def _find_all_authors_books(tx, author_name, author_surname):
@@ -149,28 +342,34 @@ class App:
         return [row["name"] for row in result]
 
     def other_read_also(self, book_name):
+        book_ids = self._book_ids(book_name)
         with self.driver.session() as session:
             result = session.read_transaction(
-                self._other_read_also, book_name
+                self._other_read_also, book_ids
             )
-            print("Other users read also: ")
-            i = 1
-            for row in result:
-                print(i, ". {row}".format(row=row))
-                i = i+1
+            return result
+
+    def other_read_also_by_id(self, book_id):
+        with self.driver.session() as session:
+            result = session.read_transaction(
+                self._other_read_also, [book_id]
+            )
+            return result
 
     @staticmethod
-    def _other_read_also(tx, book_name):
+    def _other_read_also(tx, book_ids):
         query = (
             """
-            MATCH (b:Book {name: $book_name})
-            OPTIONAL MATCH (b)<-[:READ]-(reader)-[r:READ]->(other_book)
+            MATCH (b:Book)
+            WHERE b.uid IN $book_ids
+            MATCH (b)<-[:READ]-(reader:Reader)-[:READ]->(other_book:Book)
+            WHERE other_book <> b
             RETURN other_book.name AS title, count(*) AS occurance
             ORDER BY occurance
-            DESC 
+            DESC
             """
         )
-        result = tx.run(query, book_name=book_name)
+        result = tx.run(query, book_ids=book_ids)
         return [row for row in result]
 
     def find_book_by_year_and_category(self, year_since_book_created, year_to_book_created, category):
@@ -178,11 +377,7 @@ class App:
             result = session.read_transaction(
                 self._find_book_by_year_and_category, year_since_book_created, year_to_book_created, category
             )
-            print("Books you are looking for: ")
-            i = 1
-            for row in result:
-                print(i, ". {row}".format(row=row))
-                i = i+1
+            return result
 
     @staticmethod
     def _find_book_by_year_and_category(tx, year_since_book_created, year_to_book_created, category):
@@ -202,11 +397,7 @@ class App:
             result = session.read_transaction(
                 self._best_book
             )
-            print("Books you are looking for: ")
-            i = 1
-            for row in result:
-                print(i, ". {row}".format(row=row))
-                i = i+1
+            return result
 
     @staticmethod
     def _best_book(tx):
@@ -229,11 +420,7 @@ class App:
             result = session.read_transaction(
                 self._how_many_books_publisher
             )
-            print("Publishers: ")
-            i = 1
-            for row in result:
-                print(i, ". {row}".format(row=row))
-                i = i+1
+            return result
 
     @staticmethod
     def _how_many_books_publisher(tx):
@@ -251,11 +438,7 @@ class App:
             result = session.write_transaction(
                 self._set_literary_period_for_book
             )
-            print("Books and literary periods ")
-            i = 1
-            for row in result:
-                print(i, ". {row}".format(row=row))
-                i = i+1
+            return result
 
     @staticmethod
     def _set_literary_period_for_book(tx):
@@ -282,11 +465,7 @@ class App:
             result = session.write_transaction(
                 self._set_literary_period_description
             )
-            print("Books and literary periods description")
-            i = 1
-            for row in result:
-                print(i, ". {row}".format(row=row))
-                i = i+1
+            return result
 
     @staticmethod
     def _set_literary_period_description(tx):
@@ -331,25 +510,10 @@ class App:
             result_recommend_by_similarity = session.read_transaction(
                 self._similarity_query_with_recommendation, reader_name, reader_surname
             )
-            print("Mean similarity for the graph: ")
-            for row in result_mean_similarity:
-                print("{row}".format(row=row))
-
-            print("Similar readers: ")
-            i = 1
-            for row in result_similar_readers:
-                print(i, ". {row}".format(row=row))
-                i = i+1
-
-            print("For %s %s is recommended: " % (reader_name, reader_surname))
-            i = 1
-            for row in result_recommend_by_similarity:
-                print(i, ". {row}".format(row=row))
-                i = i + 1
-
             session.write_transaction(
                 self._similarity_delete_graph
             )
+            return result_mean_similarity, result_similar_readers, result_recommend_by_similarity
 
     @staticmethod
     def _similarity_create_project(tx):
@@ -450,21 +614,24 @@ class App:
 
     def delete_reader(self, reader_name, reader_surname):
         with self.driver.session() as session:
-            session.write_transaction(
+            result = session.write_transaction(
                 self._delete_reader, reader_name, reader_surname
             )
+            return result
 
     @staticmethod
     def _delete_reader(tx, reader_name, reader_surname):
         query = (
             """
             MATCH (r:Reader {name: $reader_name, surname: $reader_surname})
+            WITH r, r.name AS name, r.surname AS surname
             DETACH DELETE r
+            RETURN name, surname
             """
         )
         result = tx.run(query, reader_name=reader_name, reader_surname=reader_surname)
         try:
-            return [{"r1": row["r1"]["name"]}
+            return [{"name": row["name"], "surname": row["surname"]}
                     for row in result]
         except ServiceUnavailable as exception:
             logging.error("{query} raised an error: \n {exception}".format(
@@ -482,11 +649,7 @@ class App:
             result = session.write_transaction(
                 self._set_avg_mark_books
             )
-            print("Best authors: ")
-            i = 1
-            for row in result:
-                print(i, ". {row}".format(row=row))
-                i = i + 1
+            return result
 
     @staticmethod
     def _set_book_amount(tx):
@@ -527,120 +690,5 @@ class App:
         return [row for row in result]
 
 if __name__ == "__main__":
-    uri = "bolt://localhost:7687"
-    user = "neo4j"
-    password = "mybase"
-    app = App(uri, user, password)
-    app.best_author()
-    #app.get_similar_users("Natalia", "Krawczyk")
-    #app.set_literary_period_description()
-    #app.set_literary_period_for_book()
-    #app.how_many_books_publisher()
-    #app.best_book()
-    #app.find_all_authors_books('Lucy', 'Montgomery')
-    #app.other_read_also('Ania z Zielonego wzgórza')
-    #app.find_book_by_year_and_category(1950, 2000, 'fantasy')
-
-    #app.create_relation_book_reader('Natalia', 'Krawczyk', 4.0, 'Opowieść o dwóch miastach')
-
-    #app.create_reader("Alicja", "Polaszewska")
-    #app.delete_reader("Alicja", "Polaszewska")
-
-    '''
-    #Authors
-    app.create_author('Lucy', 'Montgomery')
-    app.create_author('Magdalena', 'Witkiewicz')
-    app.create_author('John', 'Steinbeck')
-    app.create_author('J.R.R.', 'Tolkien')
-    app.create_author('J.D.', 'Salinger')
-    app.create_author('J.K.', 'Rowling')
-    app.create_author('Stephen', 'King')
-    app.create_author('Graham', 'Masterton')
-    app.create_author('Karol', 'Dickens')
-    app.create_author('Paulo', 'Coelho')
-    app.create_author('Antoine', 'Saint-Exupéry')
-
-    #Publishers
-    app.create_publisher('PWN')
-    app.create_publisher('Sowa')
-    app.create_publisher('Gordon')
-    app.create_publisher('Radkom')
-    
-    # BOOKS
-    app.create_book('Ania z Zielonego wzgórza', 1908, 'obyczajowe', 'Lucy', 'Montgomery', 'PWN')
-    app.create_book('Ania z Avonlea', 1909, 'obyczajowe', 'Lucy', 'Montgomery', 'PWN')
-    app.create_book('Dziewczę z sadu ', 1910, 'obyczajowe', 'Lucy', 'Montgomery', 'PWN')
-    app.create_book('Historynka', 1911, 'obyczajowe', 'Lucy', 'Montgomery', 'PWN')
-    app.create_book('Złocista droga', 1913, 'obyczajowe', 'Lucy', 'Montgomery', 'PWN')
-    app.create_book('Ania na Uniwersytecie', 1915, 'obyczajowe', 'Lucy', 'Montgomery', 'PWN')
-    app.create_book('Władca Pierścieni. Drużyna Pierścienia', 1954, 'fantasy', 'J.R.R.', 'Tolkien', 'Sowa')
-    app.create_book('Władca Pierścieni. Dwie wieże', 1954, 'fantasy', 'J.R.R.', 'Tolkien', 'Sowa')
-    app.create_book('Władca Pierścieni. Powrót króla', 1955, 'fantasy', 'J.R.R.', 'Tolkien', 'Sowa')
-    app.create_book('Władca Pierścieni. Drużyna Pierścienia', 1954, 'fantasy', 'J.R.R.', 'Tolkien', 'Sowa')
-    app.create_book('Hobbit, czyli tam i z powrotem', 1937, 'fantasy', 'J.R.R.', 'Tolkien', 'Sowa')
-    app.create_book('Buszujący w zbożu', 1951, 'realizm', 'J.D.', 'Salinger', 'Gordon')
-    app.create_book('Dziewięć opowiadań', 1953, 'realizm', 'J.D.', 'Salinger', 'Gordon')
-    app.create_book('Harry Potter i kamień Filozoficzny', 1997, 'fantasy', 'J.K.', 'Rowling', 'PWN')
-    app.create_book('Harry Potter i Komnata Tajemnic', 1998, 'fantasy', 'J.K.', 'Rowling', 'PWN')
-    app.create_book('Harry Potter i więzień Azkabanu', 1999, 'fantasy', 'J.K.', 'Rowling', 'PWN')
-    app.create_book('Harry Potter i Czara Ognia', 2000, 'fantasy', 'J.K.', 'Rowling', 'PWN')
-    app.create_book('Harry Potter i Zakon Feniksa', 2003, 'fantasy', 'J.K.', 'Rowling', 'PWN')
-    app.create_book('Harry Potter i Książę Półkrwi', 2005, 'fantasy', 'J.K.', 'Rowling', 'PWN')
-    app.create_book('Harry Potter i Insygnia Śmierci', 2007, 'fantasy', 'J.K.', 'Rowling', 'PWN')
-    app.create_book('Carrie', 1974, 'horror', 'Stephen', 'King', 'Gordon')
-    app.create_book('Lśnienie', 1977, 'horror', 'Stephen', 'King', 'Gordon')
-    app.create_book('Miasteczko Salem', 1975, 'horror', 'Stephen', 'King', 'Gordon')
-    app.create_book('Martwa strefa', 1979, 'horror', 'Stephen', 'King', 'Gordon')
-    app.create_book('Wyklęty', 1983, 'horror', 'Graham', 'Masterton', 'Gordon')
-    app.create_book('Opowieść o dwóch miastach', 1859, 'historyczna', 'Karol', 'Dickens', 'Gordon')
-    app.create_book('Alchemik', 1943, 'powiastka filozoficzna', 'Paulo', 'Coelho', 'Radkom')
-    app.create_book('Mały Książę', 1943, 'powiastka filozoficzna', 'Antoine', 'Saint-Exupéry', 'Radkom')
-    app.create_book('Córka generała', 2022, 'obyczajowe', 'Magdalena', 'Witkiewicz', 'Sowa')
-    app.create_book('Ulica Nadbrzezna', 1972, 'obyczajowe', 'John', 'Steinbeck', 'Sowa')
-
-    # READAERS
-    app.create_reader('Jan', 'Kowalski')
-    app.create_reader('Karolina', 'Piasecka')
-    app.create_reader('Natalia', 'Krawczyk')
-    app.create_reader('Krystian', 'Tomczyk')
-    app.create_reader('Janina', 'Stolarek')
-    app.create_reader('Jakub', 'Kawka')
-    app.create_reader('Jan', 'Kownacki')
-    app.create_reader('Alicja', 'Antecka')
-    app.create_reader('Julia', 'Kamyk')
-    app.create_reader('Kryspin', 'Nowak')
-    app.create_reader('Grzegorz', 'Zwierzyński')
-
-    # READERS AND BOOKS
-    app.create_relation_book_reader('Jan', 'Kowalski', 9, 'Ania z Zielonego wzgórza')
-    app.create_relation_book_reader('Karolina', 'Piasecka', 9.5, 'Ania z Zielonego wzgórza')
-    app.create_relation_book_reader('Natalia', 'Krawczyk', 7, 'Ania z Zielonego wzgórza')
-    app.create_relation_book_reader('Julia', 'Kamyk', 8.5, 'Ania z Zielonego wzgórza')
-    app.create_relation_book_reader('Karolina', 'Piasecka', 6.0, 'Ania z Avonlea')
-    app.create_relation_book_reader('Karolina', 'Piasecka', 7.0, 'Ania na Uniwersytecie')
-    app.create_relation_book_reader('Julia', 'Kamyk', 10, 'Ania z Avonlea')
-    app.create_relation_book_reader('Julia', 'Kamyk', 5.0, 'Ania na Uniwersytecie')
-    app.create_relation_book_reader('Karolina', 'Piasecka', 9.5, 'Buszujący w zbożu')
-    app.create_relation_book_reader('Natalia', 'Krawczyk', 8, 'Buszujący w zbożu')
-
-    app.create_relation_book_reader('Grzegorz', 'Zwierzyński', 8, 'Harry Potter i kamień Filozoficzny')
-    app.create_relation_book_reader('Grzegorz', 'Zwierzyński', 8, 'Harry Potter i Komnata Tajemnic')
-    app.create_relation_book_reader('Julia', 'Kamyk', 6.5, 'Harry Potter i kamień Filozoficzny')
-    app.create_relation_book_reader('Julia', 'Kamyk', 8.5, 'Harry Potter i Komnata Tajemnic')
-    app.create_relation_book_reader('Julia', 'Kamyk', 7.5, 'Harry Potter i więzień Azkabanu')
-    app.create_relation_book_reader('Julia', 'Kamyk', 8.5, 'Harry Potter i Czara Ognia')
-    app.create_relation_book_reader('Julia', 'Kamyk', 5.5, 'Opowieść o dwóch miastach')
-    app.create_relation_book_reader('Jan', 'Kownacki', 6.5, 'Opowieść o dwóch miastach')
-    app.create_relation_book_reader('Jan', 'Kownacki', 8.5, 'Mały Książę')
-    app.create_relation_book_reader('Jan', 'Kownacki', 6.5, 'Alchemik')
-    app.create_relation_book_reader('Alicja', 'Antecka', 8.5, 'Lśnienie')
-    app.create_relation_book_reader('Alicja', 'Antecka', 7.5, 'Carrie')
-    app.create_relation_book_reader('Jakub', 'Kawka', 8.5, 'Carrie')
-    app.create_relation_book_reader('Jakub', 'Kawka', 6.5, 'Alchemik')
-    app.create_relation_book_reader('Kryspin', 'Nowak', 5, 'Opowieść o dwóch miastach')
-    app.create_relation_book_reader('Kryspin', 'Nowak', 7.5, 'Buszujący w zbożu')
-    app.create_relation_book_reader('Karolina', 'Piasecka', 9.5, 'Córka generała')
-    app.create_relation_book_reader('Karolina', 'Piasecka', 5.5, 'Ulica Nadbrzezna')
-    '''
-
-    app.close()
+    import cli
+    cli.main()
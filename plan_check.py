@@ -0,0 +1,333 @@
+"""Query plan regression check for every Cypher statement issued by App.
+
+Collects the statements by calling each App transaction function with a
+recording transaction, then runs EXPLAIN on them against a throwaway Neo4j
+container (NEO4J_IMAGE with APOC and GDS, on a random local port) seeded
+with dataset.py and given the lookup and title indexes. --uri points the
+check at an already running scratch instance instead; it is refused when
+it is the database cli.py is configured for, since the check writes to it.
+Each plan must pass these rules:
+
+- keyed lookups (a property map, ``WHERE x.prop = $param`` or ``IN $param``) do not use
+  NodeByLabelScan or AllNodesScan
+- no CartesianProduct
+- no Eager operator
+- no operator estimates more than --max-rows rows
+
+Plans are also compared with the snapshots in plans/; a changed or missing
+snapshot fails until it is recorded with --update. A statement whose EXPLAIN
+raises is reported as a failure and the run carries on. EXPECTED_FAILURES
+names, per statement, the kinds of rule violation it is known to have; those
+are reported but do not fail the run, while any other kind, a snapshot
+change or an error still does. Exits non-zero on any failure.
+``--self-check`` only runs the rules on a sample plan and needs no database.
+"""
+import argparse
+import difflib
+import inspect
+import os
+import re
+import secrets
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+import cli
+import dataset
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_DIR = os.path.join(HERE, "plans")
+MAX_ESTIMATED_ROWS = 1000
+# Pinned: the snapshots record operator Details, which change between releases.
+NEO4J_IMAGE = "neo4j:5.26.0-community"
+NEO4J_PLUGINS = '["apoc", "graph-data-science"]'
+STARTUP_TIMEOUT = 180
+
+# Argument values passed to transaction functions, by parameter name.
+SAMPLE_ARGS = {
+    "reader_name": "Natalia", "reader_surname": "Krawczyk",
+    "person_name": "Natalia", "person_surname": "Krawczyk",
+    "author_name": "J.K.", "author_surname": "Rowling",
+    "publisher_name": "PWN",
+    "book_ids": ["00000000-0000-0000-0000-000000000000"],
+    "book_name": "Alchemik", "book_years": 1943, "book_category": "fantasy",
+    "mark": 8.0,
+    "year_since_book_created": 1950, "year_to_book_created": 2000, "category": "fantasy",
+    "search": "(harry~ OR harry*)", "limit": 5,
+}
+
+# Kinds of rule violation reported by check_rules.
+LABEL_SCAN = "label-scan"
+CARTESIAN_PRODUCT = "cartesian-product"
+EAGER = "eager"
+ESTIMATED_ROWS = "estimated-rows"
+
+# Violation kinds each statement is known to have, by statement name. Only
+# these kinds are tolerated; the run notes "xpass" for a kind that no longer
+# shows up so its entry can be removed. Both statements match two node
+# patterns with no relationship between them, which Cypher plans as a
+# CartesianProduct of the two seeks.
+EXPECTED_FAILURES = {
+    "_create_and_return_book": {CARTESIAN_PRODUCT},
+    "_create_relation_book_reader": {CARTESIAN_PRODUCT},
+}
+
+SCHEMA_STATEMENT = re.compile(r"^\s*(CREATE|DROP)\s+(FULLTEXT\s+)?(INDEX|CONSTRAINT)\b", re.I)
+KEYED_LOOKUP = re.compile(r":\s*\w+\s*\{[^}]*\$|\bWHERE\s+\w+\.\w+\s*(=|IN)\s*\$", re.I)
+LABEL_SCANS = {"NodeByLabelScan", "AllNodesScan"}
+
+
+class RecordingTransaction:
+    """Stands in for a neo4j transaction and keeps the statements it is given."""
+
+    def __init__(self):
+        self.statements = []
+
+    def run(self, query, **parameters):
+        self.statements.append((query, parameters))
+        return self
+
+    def __iter__(self):
+        return iter(())
+
+    def consume(self):
+        return None
+
+
+def collect_statements(app_class):
+    """Yield (name, query, parameters) for every statement app_class runs."""
+    for name, member in sorted(vars(app_class).items()):
+        if not isinstance(member, staticmethod):
+            continue
+        params = list(inspect.signature(member.__func__).parameters)
+        if not params or params[0] != "tx":
+            continue
+        tx = RecordingTransaction()
+        member.__func__(tx, *[SAMPLE_ARGS[param] for param in params[1:]])
+        for i, (query, parameters) in enumerate(tx.statements):
+            if SCHEMA_STATEMENT.match(query):
+                continue
+            label = name if len(tx.statements) == 1 else "%s.%d" % (name, i)
+            yield label, query.strip().rstrip(";"), parameters
+
+
+def _operator(node):
+    return node["operatorType"].split("@")[0]
+
+
+def _walk(node):
+    yield node
+    for child in node.get("children", ()):
+        yield from _walk(child)
+
+
+def check_rules(query, plan, max_rows):
+    """Return (kind, message) for every rule the plan breaks."""
+    problems = []
+    keyed = KEYED_LOOKUP.search(query) is not None
+    for node in _walk(plan):
+        operator = _operator(node)
+        if keyed and operator in LABEL_SCANS:
+            problems.append((LABEL_SCAN, "%s on a keyed lookup" % operator))
+        if operator == "CartesianProduct":
+            problems.append((CARTESIAN_PRODUCT, "CartesianProduct"))
+        if operator == "Eager":
+            problems.append((EAGER, "Eager operator"))
+        rows = node.get("args", {}).get("EstimatedRows", 0)
+        if rows > max_rows:
+            problems.append((ESTIMATED_ROWS, "%s estimates %d rows (limit %d)" % (operator, rows, max_rows)))
+    return problems
+
+
+def render_plan(node, depth=0):
+    details = node.get("args", {}).get("Details")
+    line = "  " * depth + _operator(node) + (" | %s" % details if details else "")
+    return "\n".join([line] + [render_plan(child, depth + 1) for child in node.get("children", ())])
+
+
+def check_snapshot(name, rendered, update):
+    path = os.path.join(SNAPSHOT_DIR, name + ".txt")
+    if not update:
+        if not os.path.exists(path):
+            return ["no snapshot in plans/ (rerun with --update to record it)"]
+        with open(path, encoding="utf-8") as f:
+            expected = f.read().rstrip("\n")
+        if expected == rendered:
+            return []
+        diff = difflib.unified_diff(expected.splitlines(), rendered.splitlines(),
+                                    "snapshot", "current", lineterm="")
+        return ["plan changed (rerun with --update to accept):\n    " + "\n    ".join(diff)]
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(rendered + "\n")
+    return []
+
+
+# The raw Bolt plan the driver returns as summary.plan, trimmed to what the
+# rules read: a CartesianProduct of an index seek and a label scan.
+SAMPLE_PLAN = {
+    "operatorType": "ProduceResults@neo4j",
+    "identifiers": ["a", "b"],
+    "args": {"EstimatedRows": 1500.0, "Details": "a, b"},
+    "children": [{
+        "operatorType": "CartesianProduct@neo4j",
+        "identifiers": ["a", "b"],
+        "args": {"EstimatedRows": 1500.0},
+        "children": [
+            {"operatorType": "NodeIndexSeek@neo4j", "identifiers": ["a"],
+             "args": {"EstimatedRows": 1.0, "Details": "RANGE INDEX a:Author(name) WHERE name = $author_name"}},
+            {"operatorType": "NodeByLabelScan@neo4j", "identifiers": ["b"],
+             "args": {"EstimatedRows": 30.0, "Details": "b:Book"}},
+        ],
+    }],
+}
+SAMPLE_QUERY = "MATCH (a:Author {name: $author_name}), (b:Book) RETURN a, b"
+SAMPLE_PROBLEMS = [
+    (ESTIMATED_ROWS, "ProduceResults estimates 1500 rows (limit 1000)"),
+    (CARTESIAN_PRODUCT, "CartesianProduct"),
+    (ESTIMATED_ROWS, "CartesianProduct estimates 1500 rows (limit 1000)"),
+    (LABEL_SCAN, "NodeByLabelScan on a keyed lookup"),
+]
+SAMPLE_RENDERED = """ProduceResults | a, b
+  CartesianProduct
+    NodeIndexSeek | RANGE INDEX a:Author(name) WHERE name = $author_name
+    NodeByLabelScan | b:Book"""
+
+
+def self_check():
+    """Exit with an error if the rules or the renderer misread SAMPLE_PLAN."""
+    problems = check_rules(SAMPLE_QUERY, SAMPLE_PLAN, MAX_ESTIMATED_ROWS)
+    if problems != SAMPLE_PROBLEMS:
+        raise SystemExit("self-check: rules found %r, expected %r" % (problems, SAMPLE_PROBLEMS))
+    rendered = render_plan(SAMPLE_PLAN)
+    if rendered != SAMPLE_RENDERED:
+        raise SystemExit("self-check: plan rendered as\n%s\nexpected\n%s" % (rendered, SAMPLE_RENDERED))
+
+
+def start_database():
+    """Start a throwaway Neo4j container; return (container, uri, password)."""
+    password = secrets.token_hex(8)
+    try:
+        container = subprocess.run(
+            ["docker", "run", "-d", "--rm", "-p", "127.0.0.1::7687",
+             "-e", "NEO4J_AUTH=neo4j/" + password, "-e", "NEO4J_PLUGINS=" + NEO4J_PLUGINS, NEO4J_IMAGE],
+            check=True, capture_output=True, text=True).stdout.strip()
+    except FileNotFoundError:
+        raise SystemExit("docker is needed to start a throwaway Neo4j; install it or pass --uri")
+    except subprocess.CalledProcessError as exception:
+        raise SystemExit("could not start %s:\n%s" % (NEO4J_IMAGE, exception.stderr))
+    ports = subprocess.run(["docker", "port", container, "7687/tcp"],
+                           check=True, capture_output=True, text=True).stdout
+    port = ports.splitlines()[0].rsplit(":", 1)[1]
+    return container, "bolt://127.0.0.1:%s" % port, password
+
+
+def stop_database(container):
+    subprocess.run(["docker", "rm", "-f", container], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_until_ready(app):
+    from neo4j.exceptions import ServiceUnavailable
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while True:
+        try:
+            app.driver.verify_connectivity()
+            return
+        except ServiceUnavailable:
+            if time.monotonic() > deadline:
+                raise SystemExit("Neo4j did not start within %d s" % STARTUP_TIMEOUT)
+            time.sleep(1)
+
+
+def _address(uri):
+    parts = urlsplit(uri)
+    host = parts.hostname or "localhost"
+    return ("127.0.0.1" if host == "localhost" else host), parts.port or 7687
+
+
+def configured_uri():
+    """The URI cli.py would connect to, even when no password is set."""
+    try:
+        return cli.load_settings()["uri"]
+    except SystemExit:
+        return os.environ.get("NEO4J_URI", cli.DEFAULT_URI)
+
+
+def prepare(app):
+    with app.driver.session() as session:
+        books = session.run("MATCH (b:Book) RETURN count(b) AS books").single()["books"]
+    if not books:
+        dataset.seed(app)
+    app.create_lookup_indexes()
+    app.create_title_index()
+    with app.driver.session() as session:
+        session.run("CALL db.awaitIndexes()").consume()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--uri", help="use this running scratch database instead of starting a container")
+    parser.add_argument("--user", default="neo4j", help="user for --uri (default: neo4j)")
+    parser.add_argument("--password", help="password for --uri (default: $PLAN_CHECK_PASSWORD)")
+    parser.add_argument("--max-rows", type=int, default=MAX_ESTIMATED_ROWS,
+                        help="largest estimated row count allowed for any operator")
+    parser.add_argument("--update", action="store_true", help="rewrite the plan snapshots")
+    parser.add_argument("--self-check", action="store_true", help="only check the rules against a sample plan")
+    args = parser.parse_args(argv)
+
+    self_check()
+    if args.self_check:
+        print("self-check ok")
+        return
+
+    from main import App
+    from neo4j.exceptions import Neo4jError
+    container = None
+    if args.uri:
+        if _address(args.uri) == _address(configured_uri()):
+            raise SystemExit("refusing to seed and index %s, the database cli.py is configured for; "
+                             "pass the URI of a scratch instance or omit --uri" % args.uri)
+        uri, user = args.uri, args.user
+        password = args.password or os.environ.get("PLAN_CHECK_PASSWORD")
+        if password is None:
+            raise SystemExit("no password for --uri: pass --password or set PLAN_CHECK_PASSWORD")
+    else:
+        container, uri, password = start_database()
+        user = "neo4j"
+    app = App(uri, user, password)
+    failed = 0
+    try:
+        wait_until_ready(app)
+        prepare(app)
+        with app.driver.session() as session:
+            for name, query, parameters in collect_statements(App):
+                try:
+                    plan = session.run("EXPLAIN " + query, parameters).consume().plan
+                except Neo4jError as exception:
+                    print("%-45s FAIL" % name)
+                    print("    EXPLAIN failed: %s" % exception)
+                    failed += 1
+                    continue
+                expected = EXPECTED_FAILURES.get(name, set())
+                violations = check_rules(query, plan, args.max_rows)
+                notes = ["expected: " + message for kind, message in violations if kind in expected]
+                notes += ["xpass: no %s any more, remove it from EXPECTED_FAILURES" % kind
+                          for kind in sorted(expected - {kind for kind, _ in violations})]
+                problems = [message for kind, message in violations if kind not in expected]
+                problems += check_snapshot(name, render_plan(plan), args.update)
+                seen = expected & {kind for kind, _ in violations}
+                status = "FAIL" if problems else "xfail" if seen else "xpass" if expected else "ok"
+                print("%-45s %s" % (name, status))
+                for note in notes + problems:
+                    print("    " + note)
+                failed += bool(problems)
+    finally:
+        app.close()
+        if container:
+            stop_database(container)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
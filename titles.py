@@ -0,0 +1,66 @@
+"""In-process title cache used for autocomplete and exact title resolution.
+
+Titles are compared in folded form: case-insensitive, without Polish
+diacritics and with surrounding / repeated whitespace removed, so that
+'harry potter i kamien filozoficzny' and 'Dziewczę z sadu' resolve to the
+titles stored in the database.
+"""
+import bisect
+import re
+import unicodedata
+
+# Letters that NFKD does not decompose into a base letter plus a diacritic.
+_EXTRA_FOLDS = str.maketrans({"ł": "l", "ø": "o", "đ": "d", "ß": "ss"})
+_SPACES = re.compile(r"\s+")
+_WORD = re.compile(r"\w+")
+
+
+def fold(text):
+    text = unicodedata.normalize("NFKD", text.casefold()).translate(_EXTRA_FOLDS)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return _SPACES.sub(" ", text).strip()
+
+
+def fulltext_query(text):
+    """Lucene query matching every word of text, fuzzily or as a prefix.
+
+    Words are split the way the standard analyzer splits them, so
+    'Saint-Exupéry' becomes the terms saint and exupery.
+    """
+    terms = _WORD.findall(fold(text))
+    return " AND ".join("(%s~ OR %s*)" % (term, term) for term in terms)
+
+
+class TitleIndex:
+    """Sorted array of folded titles, kept up to date as books are added."""
+
+    def __init__(self, books=()):
+        self._keys = []
+        self._entries = []
+        self._by_key = {}
+        for book_id, title in books:
+            self.add(book_id, title)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, book_id, title):
+        key = fold(title)
+        pos = bisect.bisect_right(self._keys, key)
+        self._keys.insert(pos, key)
+        self._entries.insert(pos, (book_id, title))
+        self._by_key.setdefault(key, []).append((book_id, title))
+
+    def resolve(self, title):
+        """Return every (book_id, stored title) whose title folds to the same key."""
+        return list(self._by_key.get(fold(title), ()))
+
+    def complete(self, prefix, limit=10):
+        """Return up to limit (book_id, title) pairs whose title starts with prefix."""
+        key = fold(prefix)
+        pos = bisect.bisect_left(self._keys, key)
+        matches = []
+        while pos < len(self._keys) and len(matches) < limit and self._keys[pos].startswith(key):
+            matches.append(self._entries[pos])
+            pos += 1
+        return matches